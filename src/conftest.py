@@ -0,0 +1,27 @@
+"""pytest configuration for the test modules in src/"""
+
+import sys
+from pathlib import Path
+
+import pytest
+
+# Let tests import project modules the same way the scripts in src/ do
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+
+def pytest_addoption(parser):
+    group = parser.getgroup('golden', 'golden-feature regression checks')
+    group.addoption('--update-golden', action='store_true', default=False,
+                    help='regenerate the stored reference features')
+    group.addoption('--golden-rtol', type=float, default=None,
+                    help='override the relative tolerance for every variant')
+    group.addoption('--golden-atol', type=float, default=None,
+                    help='override the absolute tolerance for every variant')
+    group.addoption('--time-scale', type=float, default=1.0,
+                    help='multiply every timing budget (e.g. 3 on slow machines)')
+
+
+@pytest.fixture
+def time_scale(request):
+    """Multiplier for timing budgets, from --time-scale"""
+    return request.config.getoption('--time-scale')
@@ -0,0 +1,239 @@
+"""Multi-resolution feature pyramid with cached summary statistics"""
+
+from collections import OrderedDict
+from pathlib import Path
+
+import numpy as np
+
+DEFAULT_PERCENTILES = (10, 25, 50, 75, 90)
+_SUMMARY_KEYS = ('mean', 'std', 'delta_mean', 'delta_std', 'frames')
+
+
+def _prefix_sums(frames):
+    """Cumulative sums with a leading zero column, so sum(a:b) = S[b] - S[a]"""
+    sums = np.zeros((frames.shape[0], frames.shape[1] + 1))
+    np.cumsum(frames, axis=1, out=sums[:, 1:])
+    return sums
+
+
+def _moments(sums, sq_sums, starts, ends, offset):
+    """Mean and std of frames [start, end) from prefix sums
+
+    starts/ends may be scalars or arrays of ranges; empty ranges give NaN.
+    """
+    counts = np.asarray(ends - starts, dtype=np.float64)
+    total = sums[:, ends] - sums[:, starts]
+    sq_total = sq_sums[:, ends] - sq_sums[:, starts]
+    with np.errstate(invalid='ignore', divide='ignore'):
+        mean = np.where(counts > 0, total / counts, np.nan)
+        var = np.maximum(sq_total / counts - mean**2, 0.0)
+    if mean.ndim == 2:
+        offset = offset[:, None]
+    return mean + offset, np.sqrt(var)
+
+
+class FeaturePyramid:
+    """Frame-level, windowed and whole-clip views of one feature matrix
+
+    Built in one pass from a (n_features, n_frames) matrix such as an MFCC.
+    Prefix sums of the values, their squares and their first differences
+    are kept, so mean/std/delta statistics for any frame range cost O(1).
+    The 1-second windows and the whole-clip summary are precomputed at
+    build time and served from the cache. The frame matrix itself is not
+    kept once the percentiles have been computed.
+    """
+
+    def __init__(self, frames, sr=22050, hop_length=512, window_seconds=1.0,
+                 percentiles=DEFAULT_PERCENTILES):
+        frames = np.asarray(frames, dtype=np.float64)
+        if frames.ndim == 1:
+            frames = frames[None, :]
+        self.n_features, self._n_frames = frames.shape
+        self.sr = sr
+        self.hop_length = hop_length
+        self.frame_rate = sr / hop_length
+        self.window_frames = max(1, int(round(window_seconds * self.frame_rate)))
+        self.percentiles = tuple(percentiles)
+
+        # Centre values and deltas on their clip means before accumulating
+        # to keep the sum-of-squares variance numerically stable on long clips
+        deltas = np.diff(frames, axis=1)
+        self._offset = frames.mean(axis=1) if frames.shape[1] else np.zeros(len(frames))
+        self._delta_offset = deltas.mean(axis=1) if deltas.shape[1] else np.zeros(len(frames))
+        centred = frames - self._offset[:, None]
+        centred_deltas = deltas - self._delta_offset[:, None]
+        self._sums = _prefix_sums(centred)
+        self._sq_sums = _prefix_sums(centred**2)
+        self._delta_sums = _prefix_sums(centred_deltas)
+        self._delta_sq_sums = _prefix_sums(centred_deltas**2)
+
+        self._summary = self._build_summary(frames)
+        self._windows = self._build_windows()
+
+    @classmethod
+    def from_audio(cls, y, sr=22050, hop_length=512, n_mfcc=13, **kwargs):
+        """Build a pyramid over the MFCC of an audio signal"""
+        import librosa
+
+        mfcc = librosa.feature.mfcc(y=y, sr=sr, n_mfcc=n_mfcc, hop_length=hop_length)
+        return cls(mfcc, sr=sr, hop_length=hop_length, **kwargs)
+
+    @property
+    def n_frames(self):
+        return self._n_frames
+
+    @property
+    def n_windows(self):
+        return len(self._windows['start'])
+
+    def range_stats(self, start, end):
+        """Mean, std and delta mean/std for frames [start, end) in O(1)
+
+        Statistics of an empty range (or of deltas over a single frame)
+        are NaN.
+        """
+        start = int(np.clip(start, 0, self.n_frames))
+        end = int(np.clip(end, start, self.n_frames))
+        mean, std = _moments(self._sums, self._sq_sums, start, end, self._offset)
+        # Deltas between frames i and i+1 live at index i
+        d_start = min(start, self.n_frames - 1) if self.n_frames else 0
+        d_end = max(d_start, end - 1)
+        delta_mean, delta_std = _moments(self._delta_sums, self._delta_sq_sums,
+                                         d_start, d_end, self._delta_offset)
+        return {
+            'mean': mean,
+            'std': std,
+            'delta_mean': delta_mean,
+            'delta_std': delta_std,
+            'frames': end - start,
+        }
+
+    def time_stats(self, t_start, t_end):
+        """range_stats for a time span given in seconds"""
+        return self.range_stats(int(t_start * self.frame_rate),
+                                int(np.ceil(t_end * self.frame_rate)))
+
+    def summary(self):
+        """Cached whole-clip statistics"""
+        return self._summary
+
+    def window(self, index):
+        """Cached statistics for one 1-second window"""
+        return {key: values[index] for key, values in self._windows.items()}
+
+    def windows(self):
+        """Cached statistics for all windows, stacked as (n_windows, ...) arrays"""
+        return self._windows
+
+    def _build_summary(self, frames):
+        summary = self.range_stats(0, self.n_frames)
+        if self.n_frames:
+            values = np.percentile(frames, self.percentiles, axis=1)
+        else:
+            values = np.full((len(self.percentiles), self.n_features), np.nan)
+        summary['percentiles'] = dict(zip(self.percentiles, values))
+        return summary
+
+    def _build_windows(self):
+        starts = np.arange(0, self.n_frames, self.window_frames)
+        ends = np.minimum(starts + self.window_frames, self.n_frames)
+
+        # Vectorised range_stats over every window at once
+        mean, std = _moments(self._sums, self._sq_sums, starts, ends, self._offset)
+        d_ends = np.maximum(starts, ends - 1)
+        delta_mean, delta_std = _moments(self._delta_sums, self._delta_sq_sums,
+                                         starts, d_ends, self._delta_offset)
+
+        return {
+            'start': starts,
+            'end': ends,
+            'mean': mean.T,
+            'std': std.T,
+            'delta_mean': delta_mean.T,
+            'delta_std': delta_std.T,
+        }
+
+    def save(self, path):
+        """Store the cached summary and window statistics as .npz"""
+        arrays = {
+            'percentile_levels': np.array(self.percentiles),
+            'percentiles': np.stack([self._summary['percentiles'][p]
+                                     for p in self.percentiles]),
+        }
+        for key in _SUMMARY_KEYS:
+            arrays[f'summary_{key}'] = np.asarray(self._summary[key])
+        for key, values in self._windows.items():
+            arrays[f'window_{key}'] = values
+        np.savez_compressed(path, **arrays)
+
+    @staticmethod
+    def load_summary(path):
+        """Load saved (summary, windows), matching summary() and windows()"""
+        with np.load(path) as data:
+            summary = {key: data[f'summary_{key}'] for key in _SUMMARY_KEYS}
+            summary['frames'] = int(summary['frames'])
+            summary['percentiles'] = dict(zip(data['percentile_levels'].tolist(),
+                                              data['percentiles']))
+            windows = {key[len('window_'):]: data[key]
+                       for key in data.files if key.startswith('window_')}
+        return summary, windows
+
+
+class PyramidCache:
+    """Per-clip cache of pyramid summaries, optionally backed by a directory
+
+    Only the (summary, windows) statistics are kept per clip. Live
+    pyramids, which hold the prefix sums needed for arbitrary range
+    queries, are kept for at most keep_pyramids recently added clips.
+    """
+
+    def __init__(self, cache_dir=None, keep_pyramids=0, **pyramid_options):
+        self.cache_dir = Path(cache_dir) if cache_dir is not None else None
+        self.keep_pyramids = keep_pyramids
+        self.pyramid_options = pyramid_options
+        self._pyramids = OrderedDict()
+        self._summaries = {}
+        if self.cache_dir is not None:
+            self.cache_dir.mkdir(parents=True, exist_ok=True)
+
+    def _path(self, clip_id):
+        return self.cache_dir / f'{clip_id}.pyramid.npz'
+
+    def add(self, clip_id, frames):
+        """Build (or replace) the pyramid for a clip from its frame matrix"""
+        pyramid = FeaturePyramid(frames, **self.pyramid_options)
+        self._summaries[clip_id] = (pyramid.summary(), pyramid.windows())
+        self._pyramids.pop(clip_id, None)
+        if self.keep_pyramids > 0:
+            self._pyramids[clip_id] = pyramid
+            while len(self._pyramids) > self.keep_pyramids:
+                self._pyramids.popitem(last=False)
+        if self.cache_dir is not None:
+            pyramid.save(self._path(clip_id))
+        return pyramid
+
+    def get(self, clip_id):
+        """Return the live pyramid for a clip if it is still kept, or None"""
+        pyramid = self._pyramids.get(clip_id)
+        if pyramid is not None:
+            self._pyramids.move_to_end(clip_id)
+        return pyramid
+
+    def summary(self, clip_id):
+        """Whole-clip summary, loaded from disk on first access if needed"""
+        return self._load(clip_id)[0]
+
+    def windows(self, clip_id):
+        """Windowed statistics, loaded from disk on first access if needed"""
+        return self._load(clip_id)[1]
+
+    def _load(self, clip_id):
+        if clip_id not in self._summaries:
+            if self.cache_dir is None or not self._path(clip_id).exists():
+                raise KeyError(clip_id)
+            self._summaries[clip_id] = FeaturePyramid.load_summary(self._path(clip_id))
+        return self._summaries[clip_id]
+
+    def __contains__(self, clip_id):
+        return clip_id in self._summaries or (
+            self.cache_dir is not None and self._path(clip_id).exists())
@@ -6,6 +6,8 @@ from pathlib import Path
 import subprocess
 import librosa
 
+from utils.signals import generate_signals
+
 def create_project_audio_samples():
     """Generate audio samples for voice processing project"""
     
@@ -14,30 +16,12 @@ def create_project_audio_samples():
     
     sr = 44100
     duration = 3.0
-    t = np.linspace(0, duration, int(sr * duration))
-    
-    # Voice-like test signals for our project
-    samples = {}
-    
-    # 1. Synthetic vowel formants (voice processing relevant)
-    f1, f2, f3 = 730, 1090, 2440  # "ah" vowel formants
-    vowel = (np.sin(2*np.pi*f1*t) + 0.7*np.sin(2*np.pi*f2*t) + 0.3*np.sin(2*np.pi*f3*t)) * 0.2
-    envelope = np.exp(-t*0.5) * (1 + 0.1*np.sin(2*np.pi*5*t))  # Natural speech envelope
-    samples['synthetic_vowel'] = vowel * envelope
-    
-    # 2. Harmonic series (voice fundamental + harmonics)
-    f0 = 150  # Typical male voice fundamental
-    voice_like = np.zeros_like(t)
-    for h in range(1, 8):
-        amp = 1.0 / (h**0.8)  # More realistic harmonic rolloff
-        voice_like += amp * np.sin(2*np.pi*f0*h*t)
-    voice_like *= np.exp(-t*0.3) * 0.15
-    samples['voice_harmonics'] = voice_like
     
-    # 3. Frequency sweep for spectral analysis
-    f_start, f_end = 80, 8000  # Voice frequency range
-    chirp = np.sin(2*np.pi * (f_start + (f_end-f_start)*t/duration) * t) * 0.2
-    samples['frequency_sweep'] = chirp
+    # Voice-like test signals for our project: vowel formants, harmonic
+    # series and frequency sweep (see utils/signals.py)
+    signals = generate_signals(sr=sr, duration=duration)
+    samples = {name: signals[name]
+               for name in ('synthetic_vowel', 'voice_harmonics', 'frequency_sweep')}
     
     # Save all samples and analyze
     print("Generated Voice Processing Test Samples")
@@ -5,7 +5,9 @@ import numpy as np
 import sounddevice as sd
 import time
 from IPython.display import Audio, display
-import matplotlib.pyplot as plt
+
+from utils.playback import PlaybackQueue, prepare_buffer
+from utils.signals import generate_signals
 
 def create_test_sounds():
     """Create various test sounds for playback"""
@@ -21,12 +23,9 @@ def create_test_sounds():
         'description': 'Pure sine wave (A4 - 440 Hz)'
     }
     
-    # 2. Major chord (A major triad)
-    chord = (np.sin(2 * np.pi * 440 * t) +      # A4
-             np.sin(2 * np.pi * 554.37 * t) +   # C#5  
-             np.sin(2 * np.pi * 659.25 * t))    # E5
+    # 2. Major chord (A major triad), shared with the golden tests
     sounds['major_chord'] = {
-        'audio': chord / 3,  # Normalize
+        'audio': generate_signals(sr=sr, duration=duration)['major_chord'],
         'description': 'A major chord (A-C#-E)'
     }
     
@@ -62,7 +61,7 @@ def play_sound_safe(audio, sr=22050, volume=0.3):
     """Safely play audio with volume control"""
     try:
         # Normalize and apply volume control
-        audio_normalized = audio / np.max(np.abs(audio)) * volume
+        audio_normalized = prepare_buffer(audio, volume)
         
         print(f"Playing audio... ({len(audio_normalized)/sr:.1f}s)")
         sd.play(audio_normalized, sr)
@@ -75,8 +74,8 @@ def play_sound_safe(audio, sr=22050, volume=0.3):
         print("Note: Audio playback requires working PulseAudio in WSL2")
         return False
 
-def analyze_and_play(audio, sr, description):
-    """Analyze audio features and then play it"""
+def analyze_audio(audio, sr, description):
+    """Print basic time and frequency analysis of a clip"""
     print(f"\n--- {description} ---")
     
     # Basic analysis
@@ -92,6 +91,10 @@ def analyze_and_play(audio, sr, description):
     frequencies, psd = np.fft.rfftfreq(len(audio), 1/sr), np.abs(np.fft.rfft(audio))
     dominant_freq = frequencies[np.argmax(psd)]
     print(f"Dominant frequency: {dominant_freq:.1f} Hz")
+
+def analyze_and_play(audio, sr, description):
+    """Analyze audio features and then play it"""
+    analyze_audio(audio, sr, description)
     
     # Play the sound
     success = play_sound_safe(audio, sr, volume=0.2)  # Lower volume for safety
@@ -101,6 +104,46 @@ def analyze_and_play(audio, sr, description):
     
     return success
 
+def analyze_and_queue(sounds, sr, volume=0.2, sink=None):
+    """Analyze each sound while the previous one is still playing
+
+    Clips are pre-normalized and queued on a single open output stream,
+    so playback is gapless and never waits on analysis.
+    """
+    player = PlaybackQueue(sr=sr, volume=volume, sink=sink)
+    try:
+        player.start()
+    except Exception as e:
+        print(f"Playback failed: {e}")
+        print("Note: Audio playback requires working PulseAudio in WSL2")
+        return {name: False for name in sounds}
+    
+    total_duration = 0.0
+    failure = None
+    with player:
+        try:
+            for name, sound_data in sounds.items():
+                analyze_audio(sound_data['audio'], sr, sound_data['description'])
+                duration = player.enqueue(sound_data['audio'])
+                total_duration += duration
+                print(f"Queued audio... ({duration:.1f}s, {player.pending} pending)")
+            # Bounded wait: everything queued plus a margin for stream latency
+            finished = player.wait(timeout=total_duration + 2.0)
+        except Exception as e:
+            failure = e
+            finished = False
+        played = player.played
+    
+    if finished:
+        print("Playback complete!")
+    elif player.error is not None or failure is not None:
+        print(f"Playback failed: {player.error or failure}")
+    else:
+        print("Playback timed out")
+    
+    # Only clips that actually played to the end count as successful
+    return {name: i < played for i, name in enumerate(sounds)}
+
 def test_audio_devices():
     """Test available audio devices"""
     print("Available Audio Devices:")
@@ -154,10 +197,7 @@ if __name__ == "__main__":
     # Analyze and play each sound
     print("\nTesting playback (volume set low for safety)...")
     
-    playback_results = {}
-    for name, sound_data in sounds.items():
-        success = analyze_and_play(sound_data['audio'], sr, sound_data['description'])
-        playback_results[name] = success
+    playback_results = analyze_and_queue(sounds, sr)
     
     # Summary
     successful_plays = sum(playback_results.values())
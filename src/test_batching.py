@@ -0,0 +1,90 @@
+"""Tests for the pooled NumPy/torch batching bridge"""
+
+import time
+
+import librosa
+import numpy as np
+import pytest
+import torch
+
+from utils.batching import BufferPool, as_tensor, collate
+from utils.signals import generate_signals
+
+SR = 22050
+COLLATE_BUDGET = 0.05  # seconds, times --time-scale
+
+
+def mfcc_of(y, sr):
+    return librosa.feature.mfcc(y=y, sr=sr, n_mfcc=13, hop_length=512)
+
+
+@pytest.fixture(scope='module')
+def signals():
+    return generate_signals(sr=SR, duration=3.0, seed=0, noise_level=0.01)
+
+
+def test_collate_reuses_buffers_and_masks(signals, time_scale):
+    pool = BufferPool(pin_memory=False)
+    mfccs = [mfcc_of(y[:int(SR * (1 + i * 0.5))], SR)
+             for i, y in enumerate(signals.values())]
+
+    start = time.perf_counter()
+    batch = collate(mfccs, pool=pool)
+    elapsed = time.perf_counter() - start
+    with batch:
+        lengths = [m.shape[1] for m in mfccs]
+        assert batch.features.shape == (len(mfccs), 13, max(lengths))
+        assert batch.features.dtype == torch.float32
+        assert batch.lengths.tolist() == lengths
+        assert batch.mask.sum(dim=1).tolist() == lengths
+        for i, m in enumerate(mfccs):
+            np.testing.assert_allclose(batch.features[i, :, :lengths[i]].numpy(), m,
+                                       rtol=1e-6, atol=1e-4)
+            assert not batch.features[i, :, lengths[i]:].any()
+        # NumPy and torch views share one buffer
+        batch.features.numpy()[0, 0, 0] = 42.0
+        assert batch.features[0, 0, 0].item() == 42.0
+    assert elapsed < COLLATE_BUDGET * time_scale
+
+    allocations = pool.allocations
+    for _ in range(5):
+        with collate(mfccs, pool=pool):
+            pass
+    assert pool.allocations == allocations
+
+    with pytest.raises(ValueError):
+        collate([], pool=pool)
+
+
+@pytest.mark.skipif(not torch.cuda.is_available(), reason='needs CUDA')
+def test_pinned_batch_survives_buffer_reuse(signals):
+    pool = BufferPool(pin_memory=True)
+    mfccs = [mfcc_of(y, SR) for y in signals.values()]
+
+    with collate(mfccs, pool=pool) as batch:
+        features, _, lengths = batch.to('cuda')
+    # Reuses the pinned buffers released above
+    with collate([m + 1000.0 for m in mfccs], pool=pool):
+        pass
+
+    for i, m in enumerate(mfccs):
+        np.testing.assert_allclose(features[i, :, :lengths[i]].cpu().numpy(), m,
+                                   rtol=1e-6, atol=1e-4)
+
+
+def test_collate_treats_1d_arrays_as_one_row():
+    pool = BufferPool(pin_memory=False)
+    with collate([np.ones(5), np.ones(3)], pool=pool, pad_value=-1.0) as batch:
+        assert batch.features.shape == (2, 1, 5)
+        assert batch.features[1, 0].tolist() == [1.0, 1.0, 1.0, -1.0, -1.0]
+        assert batch.mask[1].tolist() == [True, True, True, False, False]
+
+    with pytest.raises(ValueError):
+        collate([np.ones((2, 4)), np.ones((3, 4))], pool=pool)
+
+
+def test_as_tensor_shares_float32_memory():
+    array = np.arange(6, dtype=np.float32)
+    tensor = as_tensor(array)
+    array[0] = 42.0
+    assert tensor.dtype == torch.float32 and tensor[0].item() == 42.0
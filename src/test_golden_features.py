@@ -0,0 +1,249 @@
+"""Golden-feature regression tests for the optimized processing paths
+
+Run from the project root:
+
+    python -m pytest src/test_golden_features.py
+    python -m pytest src/test_golden_features.py --update-golden
+
+Reference features of the seeded synthetic signals are stored as float32
+summaries in data/processed/golden_features.npz, which is committed; the
+suite fails if it is missing or was made with another librosa version.
+Every engine variant (float32 input, pooled batching, feature pyramid,
+on-disk summary cache) must reproduce the golden keys it computes within
+per-feature tolerances and stay within a timing budget.
+"""
+
+import time
+from pathlib import Path
+
+import librosa
+import numpy as np
+import pytest
+
+from features.pyramid import FeaturePyramid, PyramidCache
+from utils.batching import BufferPool, collate
+from utils.signals import generate_signals
+
+GOLDEN_PATH = Path(__file__).resolve().parent.parent / 'data' / 'processed' / 'golden_features.npz'
+
+SR = 22050
+DURATION = 3.0
+SEED = 1234
+NOISE_LEVEL = 0.01
+HOP_LENGTH = 512
+FRAME_STRIDE = 4  # keep every 4th MFCC frame in the golden file
+
+# (rtol, atol) per feature key for variants that should match the reference
+# up to float32 storage of the golden values
+FEATURE_TOLERANCES = {
+    'mfcc_mean': (1e-5, 1e-4),
+    'mfcc_std': (1e-5, 1e-4),
+    'mfcc_median': (1e-5, 1e-4),
+    'mfcc_frames': (1e-5, 1e-4),
+    'chroma_mean': (1e-5, 1e-5),
+    'centroid_mean': (1e-6, 1e-3),
+    'rms_mean': (1e-5, 1e-6),
+}
+
+# Looser per-key tolerances for variants that change the numerics;
+# --golden-rtol/--golden-atol override every entry
+TOLERANCES = {
+    'reference': FEATURE_TOLERANCES,
+    'float32': {
+        'mfcc_mean': (1e-4, 1e-3),
+        'mfcc_std': (1e-4, 1e-3),
+        'mfcc_median': (1e-4, 1e-3),
+        'mfcc_frames': (1e-4, 1e-3),
+        'chroma_mean': (1e-4, 1e-4),
+        'centroid_mean': (1e-5, 1e-2),
+        'rms_mean': (1e-4, 1e-5),
+    },
+    'batched': FEATURE_TOLERANCES,
+    'pyramid': FEATURE_TOLERANCES,
+    'cached': FEATURE_TOLERANCES,
+}
+
+# Seconds, multiplied by --time-scale. Engine budgets cover all four
+# signals; batched/pyramid/cached start from precomputed MFCCs.
+TIME_BUDGETS = {
+    'reference': 5.0,
+    'float32': 5.0,
+    'batched': 0.05,
+    'pyramid': 0.05,
+    'cached': 0.5,
+}
+
+
+def timed(func, *args, repeat=1, **kwargs):
+    """Return func's result and its best wall-clock time over repeat runs"""
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func(*args, **kwargs)
+        best = min(best, time.perf_counter() - start)
+    return result, best
+
+
+def mfcc_of(y, sr):
+    return librosa.feature.mfcc(y=y, sr=sr, n_mfcc=13, hop_length=HOP_LENGTH)
+
+
+def summarize_mfcc(mfcc):
+    return {
+        'mfcc_mean': mfcc.mean(axis=1),
+        'mfcc_std': mfcc.std(axis=1),
+        'mfcc_median': np.median(mfcc, axis=1),
+        'mfcc_frames': mfcc[:, ::FRAME_STRIDE],
+    }
+
+
+def summarize(y, sr):
+    """Reduce full feature matrices to the compact values kept as golden data"""
+    chroma = librosa.feature.chroma_stft(y=y, sr=sr, hop_length=HOP_LENGTH)
+    centroid = librosa.feature.spectral_centroid(y=y, sr=sr, hop_length=HOP_LENGTH)
+    rms = librosa.feature.rms(y=y, hop_length=HOP_LENGTH)
+    values = summarize_mfcc(mfcc_of(y, sr))
+    values.update({
+        'chroma_mean': chroma.mean(axis=1),
+        'centroid_mean': np.atleast_1d(centroid.mean()),
+        'rms_mean': np.atleast_1d(rms.mean()),
+    })
+    return values
+
+
+# Each engine returns only the golden keys it computes itself
+
+def reference_engine(signals, mfccs, sr, tmp_path):
+    return {name: summarize(y, sr) for name, y in signals.items()}
+
+
+def float32_engine(signals, mfccs, sr, tmp_path):
+    return {name: summarize(y.astype(np.float32), sr) for name, y in signals.items()}
+
+
+def batched_engine(signals, mfccs, sr, tmp_path):
+    names = list(mfccs)
+    results = {}
+    with collate([mfccs[name] for name in names],
+                 pool=BufferPool(pin_memory=False)) as batch:
+        features = batch.features.numpy()
+        lengths = batch.lengths.numpy()
+        for i, name in enumerate(names):
+            results[name] = summarize_mfcc(features[i, :, :lengths[i]].astype(np.float64))
+    return results
+
+
+def pyramid_summary(summary):
+    return {
+        'mfcc_mean': summary['mean'],
+        'mfcc_std': summary['std'],
+        'mfcc_median': summary['percentiles'][50],
+    }
+
+
+def pyramid_engine(signals, mfccs, sr, tmp_path):
+    return {name: pyramid_summary(FeaturePyramid(mfcc, sr=sr, hop_length=HOP_LENGTH).summary())
+            for name, mfcc in mfccs.items()}
+
+
+def cached_engine(signals, mfccs, sr, tmp_path):
+    cache = PyramidCache(tmp_path / 'pyramids', sr=sr, hop_length=HOP_LENGTH)
+    for name, mfcc in mfccs.items():
+        cache.add(name, mfcc)
+
+    # A fresh cache only sees what was written to disk
+    reloaded = PyramidCache(tmp_path / 'pyramids')
+    return {name: pyramid_summary(reloaded.summary(name)) for name in mfccs}
+
+
+ENGINES = {
+    'reference': reference_engine,
+    'float32': float32_engine,
+    'batched': batched_engine,
+    'pyramid': pyramid_engine,
+    'cached': cached_engine,
+}
+
+
+def flatten(results):
+    return {f'{name}__{key}': np.asarray(value, dtype=np.float32)
+            for name, values in results.items() for key, value in values.items()}
+
+
+def write_golden(signals, path=GOLDEN_PATH):
+    """Regenerate the golden file from the reference engine"""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    np.savez_compressed(path, librosa_version=np.array(librosa.__version__),
+                        **flatten(reference_engine(signals, None, SR, None)))
+
+
+@pytest.fixture(scope='session')
+def signals():
+    return generate_signals(sr=SR, duration=DURATION, seed=SEED, noise_level=NOISE_LEVEL)
+
+
+@pytest.fixture(scope='session')
+def mfccs(signals):
+    return {name: mfcc_of(y, SR) for name, y in signals.items()}
+
+
+@pytest.fixture(scope='session')
+def golden(request, signals):
+    if request.config.getoption('--update-golden'):
+        write_golden(signals)
+    elif not GOLDEN_PATH.exists():
+        pytest.fail(f'{GOLDEN_PATH} is missing; regenerate it with '
+                    f'pytest src/test_golden_features.py --update-golden and commit it')
+
+    with np.load(GOLDEN_PATH) as data:
+        stored = {key: data[key] for key in data.files}
+    version = str(stored.pop('librosa_version'))
+    if version != librosa.__version__:
+        pytest.fail(f'golden features were made with librosa {version}, running '
+                    f'{librosa.__version__}; check the differences and rerun with '
+                    f'--update-golden')
+    return stored
+
+
+@pytest.fixture
+def tolerance(request):
+    def lookup(variant, key):
+        rtol, atol = TOLERANCES[variant][key]
+        override_rtol = request.config.getoption('--golden-rtol')
+        override_atol = request.config.getoption('--golden-atol')
+        return (rtol if override_rtol is None else override_rtol,
+                atol if override_atol is None else override_atol)
+    return lookup
+
+
+@pytest.fixture
+def budget(time_scale):
+    return lambda name: TIME_BUDGETS[name] * time_scale
+
+
+def test_signals_are_deterministic(signals):
+    again = generate_signals(sr=SR, duration=DURATION, seed=SEED, noise_level=NOISE_LEVEL)
+    other = generate_signals(sr=SR, duration=DURATION, seed=SEED + 1, noise_level=NOISE_LEVEL)
+
+    assert set(signals) == {'synthetic_vowel', 'voice_harmonics',
+                            'frequency_sweep', 'major_chord'}
+    for name, y in signals.items():
+        assert y.shape == (int(SR * DURATION),)
+        np.testing.assert_array_equal(y, again[name])
+        assert not np.array_equal(y, other[name])
+
+
+@pytest.mark.parametrize('variant', list(ENGINES))
+def test_engine_matches_golden(variant, signals, mfccs, golden, tolerance, budget, tmp_path):
+    engine = ENGINES[variant]
+    engine(signals, mfccs, SR, tmp_path / 'warmup')  # JIT and cache warm-up
+    results, elapsed = timed(engine, signals, mfccs, SR, tmp_path / 'timed')
+    results = flatten(results)
+
+    assert results
+    assert set(results) <= set(golden)
+    for key, value in results.items():
+        rtol, atol = tolerance(variant, key.split('__', 1)[1])
+        np.testing.assert_allclose(value, golden[key], rtol=rtol, atol=atol,
+                                   err_msg=f'{variant}: {key}')
+    assert elapsed < budget(variant)
@@ -0,0 +1,139 @@
+"""Tests for the non-blocking playback queue and its null/file sinks"""
+
+import time
+
+import numpy as np
+import pytest
+
+from utils.playback import FileSink, NullSink, PlaybackQueue, prepare_buffer
+from utils.signals import generate_signals
+
+SR = 22050
+
+
+class RecordingSink(NullSink):
+    """NullSink that keeps every rendered block for inspection"""
+
+    def __init__(self):
+        super().__init__(realtime=False)
+        self.blocks = []
+
+    def write(self, block):
+        self.blocks.append(block[:, 0].copy())
+
+    def played(self):
+        return np.concatenate(self.blocks) if self.blocks else np.zeros(0, np.float32)
+
+
+class FailingSink(NullSink):
+    """NullSink whose output device breaks on the first block"""
+
+    def write(self, block):
+        raise OSError("device lost")
+
+
+@pytest.fixture(scope='module')
+def signals():
+    return generate_signals(sr=SR, duration=1.0, seed=0, noise_level=0.01)
+
+
+def test_prepare_buffer_normalizes_and_downmixes(signals):
+    y = signals['major_chord']
+    buffer = prepare_buffer(y, volume=0.2)
+    assert buffer.dtype == np.float32 and buffer.flags['C_CONTIGUOUS']
+    np.testing.assert_allclose(np.max(np.abs(buffer)), 0.2, rtol=1e-6)
+
+    stereo = np.stack([y, y], axis=1)
+    np.testing.assert_allclose(prepare_buffer(stereo, volume=0.2), buffer, rtol=1e-6)
+    assert not prepare_buffer(np.zeros(10)).any()
+    with pytest.raises(ValueError):
+        prepare_buffer(np.zeros((2, 2, 2)))
+
+
+def test_streaming_playback_is_gapless(signals, time_scale):
+    sink = RecordingSink()
+    clips = list(signals.values())
+    expected = np.concatenate([prepare_buffer(y, volume=0.2) for y in clips])
+
+    with PlaybackQueue(sr=SR, volume=0.2, blocksize=1000, sink=sink) as player:
+        start = time.perf_counter()
+        for y in clips:
+            player.enqueue(y)
+        assert player.wait(timeout=1.0 * time_scale)
+        elapsed = time.perf_counter() - start
+        assert player.played == len(clips)
+
+    # The idle sink renders nothing, so the output is every clip back to back
+    np.testing.assert_array_equal(sink.played(), expected)
+    assert elapsed < 1.0 * time_scale
+
+
+def test_stereo_clips_play_as_mono(signals):
+    sink = RecordingSink()
+    y = signals['synthetic_vowel']
+    with PlaybackQueue(sr=SR, volume=0.2, sink=sink) as player:
+        player.enqueue(np.stack([y, -y * 0.5], axis=1))
+        assert player.wait(timeout=1.0)
+    assert len(sink.played()) == len(y)
+    assert player.error is None
+
+
+def test_close_drops_queued_clips(signals):
+    sink = RecordingSink()
+    player = PlaybackQueue(sr=SR, volume=0.2, sink=sink)
+    for y in signals.values():
+        player.enqueue(y)
+    player.close()
+
+    assert player.pending == 0
+    assert player.wait(timeout=0.1)
+
+    # Restarting must not replay the clips dropped by close()
+    with player:
+        player.enqueue(signals['major_chord'])
+        assert player.wait(timeout=1.0)
+    np.testing.assert_array_equal(sink.played(),
+                                  prepare_buffer(signals['major_chord'], volume=0.2))
+
+
+def test_callback_failure_wakes_wait(signals, monkeypatch):
+    player = PlaybackQueue(sr=SR, sink=RecordingSink())
+
+    def broken_render(outdata, frames):
+        raise RuntimeError("render failed")
+
+    monkeypatch.setattr(player, '_render', broken_render)
+    with player:
+        player.enqueue(signals['major_chord'])
+        assert player.wait(timeout=1.0) is False
+        assert isinstance(player.error, RuntimeError)
+        assert player.pending == 0 and player.played == 0
+        with pytest.raises(RuntimeError):
+            player.enqueue(signals['major_chord'])
+
+
+def test_sink_failure_wakes_wait(signals):
+    player = PlaybackQueue(sr=SR, sink=FailingSink())
+    player.enqueue(signals['major_chord'])
+    player.enqueue(signals['voice_harmonics'])
+    with player:
+        assert player.wait(timeout=1.0) is False
+        assert isinstance(player.error, OSError)
+        assert player.pending == 0
+
+
+def test_file_sink_records_queued_clips(signals, tmp_path):
+    sf = pytest.importorskip('soundfile')
+    path = tmp_path / 'session.wav'
+    clips = [signals['synthetic_vowel'], signals['major_chord']]
+
+    with PlaybackQueue(sr=SR, volume=0.2, sink=FileSink(path)) as player:
+        player.enqueue(clips[0])
+        time.sleep(0.05)  # idle gap between enqueues must not be recorded
+        player.enqueue(clips[1])
+        assert player.wait(timeout=1.0)
+
+    recorded, sr = sf.read(path, dtype='float32')
+    assert sr == SR
+    np.testing.assert_array_equal(
+        recorded, np.concatenate([prepare_buffer(y, volume=0.2) for y in clips]))
@@ -0,0 +1,123 @@
+"""Tests for the multi-resolution feature pyramid and its summary cache"""
+
+import time
+
+import librosa
+import numpy as np
+import pytest
+
+from features.pyramid import FeaturePyramid, PyramidCache
+from utils.signals import generate_signals
+
+SR = 22050
+SEED = 1234
+HOP_LENGTH = 512
+QUERY_BUDGET = 1e-3  # seconds per range_stats call, times --time-scale
+
+
+@pytest.fixture(scope='module')
+def mfccs():
+    signals = generate_signals(sr=SR, duration=3.0, seed=SEED, noise_level=0.01)
+    return {name: librosa.feature.mfcc(y=y, sr=SR, n_mfcc=13, hop_length=HOP_LENGTH)
+            for name, y in signals.items()}
+
+
+@pytest.fixture(scope='module')
+def mfcc(mfccs):
+    return mfccs['synthetic_vowel']
+
+
+def test_ranges_match_direct_statistics(mfcc, time_scale):
+    rng = np.random.default_rng(SEED)
+    pyramid = FeaturePyramid(mfcc, sr=SR, hop_length=HOP_LENGTH)
+
+    n_frames = mfcc.shape[1]
+    for _ in range(20):
+        start = int(rng.integers(0, n_frames - 2))
+        end = int(rng.integers(start + 2, n_frames + 1))
+        frames = mfcc[:, start:end]
+        stats = pyramid.range_stats(start, end)
+        np.testing.assert_allclose(stats['mean'], frames.mean(axis=1), rtol=1e-7, atol=1e-7)
+        np.testing.assert_allclose(stats['std'], frames.std(axis=1), rtol=1e-6, atol=1e-6)
+        deltas = np.diff(frames, axis=1)
+        np.testing.assert_allclose(stats['delta_mean'], deltas.mean(axis=1), rtol=1e-6, atol=1e-6)
+
+    windows = pyramid.windows()
+    for i, (start, end) in enumerate(zip(windows['start'], windows['end'])):
+        np.testing.assert_allclose(windows['mean'][i], mfcc[:, start:end].mean(axis=1),
+                                   rtol=1e-7, atol=1e-7)
+        if end - start > 1:
+            np.testing.assert_allclose(windows['delta_std'][i],
+                                       np.diff(mfcc[:, start:end], axis=1).std(axis=1),
+                                       rtol=1e-6, atol=1e-6)
+
+    empty = pyramid.range_stats(5, 5)
+    assert empty['frames'] == 0
+    assert np.isnan(empty['mean']).all() and np.isnan(empty['std']).all()
+    assert np.isnan(pyramid.time_stats(60.0, 61.0)['mean']).all()
+    assert np.isnan(pyramid.range_stats(5, 6)['delta_mean']).all()
+
+    summary = pyramid.summary()
+    for level, values in summary['percentiles'].items():
+        np.testing.assert_allclose(values, np.percentile(mfcc, level, axis=1))
+
+    best = float('inf')
+    for _ in range(50):
+        start = time.perf_counter()
+        pyramid.range_stats(10, 60)
+        best = min(best, time.perf_counter() - start)
+    assert best < QUERY_BUDGET * time_scale
+
+
+def assert_same_stats(actual, expected):
+    assert set(actual) == set(expected)
+    for key, value in expected.items():
+        if isinstance(value, dict):
+            assert set(actual[key]) == set(value)
+            for level in value:
+                np.testing.assert_array_equal(actual[key][level], value[level])
+        else:
+            np.testing.assert_array_equal(actual[key], value)
+
+
+def test_saved_summary_round_trips(mfcc, tmp_path):
+    pyramid = FeaturePyramid(mfcc, sr=SR, hop_length=HOP_LENGTH)
+    assert not hasattr(pyramid, 'frames')
+
+    path = tmp_path / 'clip.npz'
+    pyramid.save(path)
+    summary, windows = FeaturePyramid.load_summary(path)
+
+    assert_same_stats(summary, pyramid.summary())
+    assert isinstance(summary['frames'], int)
+    assert_same_stats(windows, pyramid.windows())
+
+
+def test_cache_keeps_only_summaries_by_default(mfccs, tmp_path):
+    cache = PyramidCache(tmp_path, sr=SR, hop_length=HOP_LENGTH)
+    for name, mfcc in mfccs.items():
+        cache.add(name, mfcc)
+
+    reloaded = PyramidCache(tmp_path)
+    for name in mfccs:
+        assert cache.get(name) is None
+        assert name in reloaded
+        assert_same_stats(reloaded.summary(name), cache.summary(name))
+        assert_same_stats(reloaded.windows(name), cache.windows(name))
+    with pytest.raises(KeyError):
+        reloaded.summary('missing')
+
+
+def test_cache_bounds_live_pyramids(mfccs):
+    cache = PyramidCache(keep_pyramids=2, sr=SR, hop_length=HOP_LENGTH)
+    names = list(mfccs)
+    cache.add(names[0], mfccs[names[0]])
+    cache.add(names[1], mfccs[names[1]])
+    assert cache.get(names[0]) is not None  # now most recently used
+    cache.add(names[2], mfccs[names[2]])
+
+    assert cache.get(names[1]) is None
+    assert cache.get(names[0]) is not None and cache.get(names[2]) is not None
+    # Summaries stay available for every clip
+    for name in names[:3]:
+        assert cache.summary(name)['frames'] == mfccs[name].shape[1]
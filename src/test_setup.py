@@ -2,10 +2,12 @@
 
 import librosa
 import numpy as np
-import matplotlib.pyplot as plt
 import torch
 from scipy import signal
 
+from features.pyramid import FeaturePyramid
+from utils.batching import as_tensor, collate
+
 def test_audio_processing():
     """Test complete audio processing workflow"""
     print("Testing Audio Processing Pipeline")
@@ -48,15 +50,20 @@ def test_audio_processing():
         tempo_val = None
     
     # Test PyTorch tensor operations
-    y_tensor = torch.from_numpy(y).float()
-    mfcc_tensor = torch.from_numpy(mfcc).float()
+    y_tensor = as_tensor(y)
     
-    # Simple neural network-style operations
-    processed_mfcc = torch.relu(mfcc_tensor)
-    mean_features = torch.mean(processed_mfcc, dim=1)
+    # Simple neural network-style operations on a pooled float32 batch
+    with collate([mfcc]) as batch:
+        processed_mfcc = torch.relu(batch.features[0])
+        mean_features = torch.mean(processed_mfcc, dim=1)
     
     print(f"PyTorch processing: {mean_features.shape}")
     
+    # Multi-resolution summaries keep temporal detail without the frames
+    mfcc_pyramid = FeaturePyramid(mfcc, sr=sr)
+    print(f"MFCC pyramid: {mfcc_pyramid.n_windows} x 1s windows, "
+          f"{len(mfcc_pyramid.summary()['percentiles'])} percentiles")
+    
     # Test scipy signal processing
     frequencies, psd = signal.periodogram(y, sr)
     dominant_freq = frequencies[np.argmax(psd)]
@@ -67,6 +74,7 @@ def test_audio_processing():
         'audio': y,
         'sample_rate': sr,
         'mfcc': mfcc,
+        'mfcc_pyramid': mfcc_pyramid,
         'chroma': chroma,
         'spectral_centroid': spectral_centroid,
         'tempo': tempo_val,
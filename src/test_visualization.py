@@ -0,0 +1,66 @@
+"""Tests for the batch spectrogram/feature visualization renderer"""
+
+import librosa
+import numpy as np
+import pytest
+
+from utils.signals import generate_signals
+from visualization.features import compute_features, decimate_columns, render_batch
+
+SR = 22050
+
+
+@pytest.fixture(scope='module')
+def signals():
+    return generate_signals(sr=SR, duration=3.0, seed=0, noise_level=0.01)
+
+
+def test_decimate_short_input_is_unchanged():
+    matrix = np.arange(12.0).reshape(3, 4)
+    decimated, frames = decimate_columns(matrix, max_columns=10)
+    np.testing.assert_array_equal(decimated, matrix)
+    np.testing.assert_array_equal(frames, np.arange(4))
+
+
+def test_decimate_mean_and_ragged_tail():
+    matrix = np.arange(10.0)[None, :]
+    decimated, frames = decimate_columns(matrix, max_columns=4, reduce='mean')
+    # 10 frames in bins of 3; the last bin is padded with the edge value
+    np.testing.assert_array_equal(frames, [0, 3, 6, 9])
+    np.testing.assert_allclose(decimated, [[1.0, 4.0, 7.0, 9.0]])
+
+
+def test_decimated_display_keeps_peaks(signals):
+    spectrogram = librosa.amplitude_to_db(
+        np.abs(librosa.stft(signals['frequency_sweep'], hop_length=512)), ref=np.max)
+    decimated, frames = decimate_columns(spectrogram, max_columns=25)
+
+    assert decimated.shape[1] <= 25
+    assert frames[0] == 0
+    np.testing.assert_allclose(decimated.max(axis=1), spectrogram.max(axis=1))
+    step = frames[1] - frames[0]
+    np.testing.assert_allclose(decimated[:, 0], spectrogram[:, :step].max(axis=1))
+
+
+def test_render_batch_writes_images(signals, tmp_path):
+    import matplotlib
+    backend = matplotlib.get_backend()
+    clips = {name: y[:SR] for name, y in list(signals.items())[:2]}
+
+    paths = render_batch(clips, tmp_path, sr=SR, workers=1, max_columns=16)
+    again = render_batch(clips, tmp_path, sr=SR, workers=1, max_columns=16)
+
+    assert paths == again == [str(tmp_path / f'{name}.png') for name in clips]
+    for path in paths:
+        with open(path, 'rb') as f:
+            assert f.read(8) == b'\x89PNG\r\n\x1a\n'
+    assert matplotlib.get_backend() == backend
+
+
+def test_compute_features_shapes(signals):
+    features = compute_features(signals['voice_harmonics'], SR)
+    n_frames = features['spectrogram'].shape[1]
+    assert features['mfcc'].shape == (13, n_frames)
+    assert features['chroma'].shape == (12, n_frames)
+    assert features['pitch'].shape == (n_frames,)
+    assert len(features['frequencies']) == features['spectrogram'].shape[0]
@@ -0,0 +1,152 @@
+"""Collate variable-length feature arrays into reusable torch batch buffers"""
+
+import threading
+
+import numpy as np
+import torch
+
+
+def _capacity(n_elements):
+    """Round a size up to the next power of two so buffers are reusable"""
+    return 1 << max(int(n_elements) - 1, 0).bit_length()
+
+
+class BufferPool:
+    """Pool of flat preallocated tensors, bucketed by power-of-two capacity
+
+    Buffers are allocated once through torch (pinned when CUDA is present,
+    so host-to-device copies can be non-blocking) and handed out as
+    contiguous views. The NumPy side writes into them through .numpy(),
+    which shares the same memory.
+    """
+
+    def __init__(self, pin_memory=None):
+        if pin_memory is None:
+            pin_memory = torch.cuda.is_available()
+        self.pin_memory = pin_memory
+        self._free = {}
+        self._lock = threading.Lock()
+        self.allocations = 0
+
+    def acquire(self, shape, dtype=torch.float32):
+        """Return a contiguous tensor view of the given shape from the pool"""
+        n_elements = int(np.prod(shape))
+        key = (_capacity(n_elements), dtype)
+        with self._lock:
+            free = self._free.get(key)
+            storage = free.pop() if free else None
+        if storage is None:
+            storage = torch.empty(key[0], dtype=dtype, pin_memory=self.pin_memory)
+            self.allocations += 1
+        return storage, storage[:n_elements].view(shape)
+
+    def release(self, storage):
+        """Return a buffer obtained from acquire() to the pool"""
+        with self._lock:
+            self._free.setdefault((storage.numel(), storage.dtype), []).append(storage)
+
+
+class Batch:
+    """Padded features with mask and lengths, backed by pooled buffers
+
+    Use as a context manager (or call release()) once the batch has been
+    consumed; the buffers are recycled for the next collate() call, so the
+    tensors must not be used after release.
+    """
+
+    def __init__(self, features, mask, lengths, pool, storages):
+        self.features = features
+        self.mask = mask
+        self.lengths = lengths
+        self._pool = pool
+        self._storages = storages
+        self._copy_events = []
+
+    def to(self, device):
+        """Copy to a device, non-blocking when the buffers are pinned
+
+        A CUDA event is recorded after an asynchronous copy, and release()
+        waits on it so the pooled buffer is not reused mid-transfer.
+        """
+        device = torch.device(device)
+        non_blocking = self._pool.pin_memory and device.type == 'cuda'
+        copies = (self.features.to(device, non_blocking=non_blocking),
+                  self.mask.to(device, non_blocking=non_blocking),
+                  self.lengths.to(device, non_blocking=non_blocking))
+        if non_blocking:
+            event = torch.cuda.Event()
+            event.record(torch.cuda.current_stream(device))
+            self._copy_events.append(event)
+        return copies
+
+    def release(self):
+        """Return the buffers to the pool once pending copies have finished"""
+        for event in self._copy_events:
+            event.synchronize()
+        self._copy_events = []
+        for storage in self._storages:
+            self._pool.release(storage)
+        self._storages = []
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.release()
+
+
+_default_pool = None
+
+
+def default_pool():
+    """Process-wide pool shared by collate() calls that do not pass one"""
+    global _default_pool
+    if _default_pool is None:
+        _default_pool = BufferPool()
+    return _default_pool
+
+
+def collate(arrays, pool=None, pad_value=0.0):
+    """Pad (n_features, n_frames) arrays along time into one float32 batch
+
+    Returns a Batch with features (batch, n_features, max_frames), a
+    boolean mask (batch, max_frames) marking valid frames, and int64
+    lengths. Each array is written once into a pooled buffer (converting
+    to float32 in place), with no intermediate per-array tensors. 1-D
+    arrays such as raw audio are treated as a single feature row.
+    """
+    pool = pool if pool is not None else default_pool()
+    arrays = [np.asarray(a) for a in arrays]
+    arrays = [a[None, :] if a.ndim == 1 else a for a in arrays]
+    if not arrays:
+        raise ValueError("collate() needs at least one array")
+    n_features = arrays[0].shape[0]
+    if any(a.shape[0] != n_features for a in arrays):
+        raise ValueError("all arrays must have the same number of feature rows")
+
+    batch_size = len(arrays)
+    max_frames = max(a.shape[1] for a in arrays)
+
+    feature_storage, features = pool.acquire((batch_size, n_features, max_frames))
+    mask_storage, mask = pool.acquire((batch_size, max_frames), torch.bool)
+    length_storage, lengths = pool.acquire((batch_size,), torch.int64)
+
+    features_np = features.numpy()
+    mask_np = mask.numpy()
+    lengths_np = lengths.numpy()
+    mask_np[:] = False
+    for i, a in enumerate(arrays):
+        n = a.shape[1]
+        features_np[i, :, :n] = a
+        features_np[i, :, n:] = pad_value
+        mask_np[i, :n] = True
+        lengths_np[i] = n
+
+    return Batch(features, mask, lengths, pool,
+                 [feature_storage, mask_storage, length_storage])
+
+
+def as_tensor(array):
+    """Share a NumPy array with torch, converting to float32 only if needed"""
+    array = np.ascontiguousarray(array, dtype=np.float32)
+    return torch.from_numpy(array)
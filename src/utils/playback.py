@@ -0,0 +1,273 @@
+"""Non-blocking playback queue with pre-rendered normalized buffers"""
+
+import queue
+import threading
+import time
+
+import numpy as np
+
+
+def prepare_buffer(audio, volume=0.3):
+    """Normalize audio once and return a contiguous mono float32 playback buffer
+
+    Multi-channel input shaped (frames, channels), as accepted by sd.play,
+    is downmixed to mono.
+    """
+    audio = np.asarray(audio, dtype=np.float32)
+    if audio.ndim == 2:
+        audio = audio.mean(axis=1)
+    elif audio.ndim != 1:
+        raise ValueError(f"expected (frames,) or (frames, channels) audio, got shape {audio.shape}")
+    peak = np.max(np.abs(audio)) if audio.size else 0.0
+    if peak > 0:
+        audio = audio * np.float32(volume / peak)
+    return np.ascontiguousarray(audio, dtype=np.float32)
+
+
+class SoundDeviceSink:
+    """Output sink backed by a callback-driven sounddevice OutputStream"""
+
+    def __init__(self, device=None):
+        self.device = device
+        self._stream = None
+
+    def start(self, callback, sr, blocksize, ready=None, on_error=None):
+        import sounddevice as sd
+
+        self._stream = sd.OutputStream(
+            samplerate=sr,
+            blocksize=blocksize,
+            channels=1,
+            dtype='float32',
+            device=self.device,
+            callback=callback,
+        )
+        self._stream.start()
+
+    def stop(self):
+        if self._stream is not None:
+            self._stream.stop()
+            self._stream.close()
+            self._stream = None
+
+
+class NullSink:
+    """Output sink that drives the callback from a thread and discards the audio
+
+    With realtime=True blocks are pulled at the sample rate, silence
+    included. With realtime=False blocks are pulled as fast as possible
+    while audio is queued, the thread sleeps while the queue is idle and
+    only the filled part of each block is written, so the rendered output
+    is exactly the queued clips back to back. That mode is useful for
+    tests and for machines without a working audio device.
+    """
+
+    def __init__(self, realtime=False):
+        self.realtime = realtime
+        self.error = None
+        self._thread = None
+        self._running = threading.Event()
+
+    def start(self, callback, sr, blocksize, ready=None, on_error=None):
+        self.error = None
+        self._running.set()
+        self._thread = threading.Thread(
+            target=self._run, args=(callback, sr, blocksize, ready, on_error), daemon=True
+        )
+        self._thread.start()
+
+    def _run(self, callback, sr, blocksize, ready, on_error):
+        outdata = np.zeros((blocksize, 1), dtype=np.float32)
+        period = blocksize / sr
+        try:
+            while self._running.is_set():
+                if self.realtime:
+                    callback(outdata, blocksize, None, None)
+                    self.write(outdata)
+                    time.sleep(period)
+                elif ready is None or ready.wait(timeout=0.05):
+                    filled = callback(outdata, blocksize, None, None)
+                    if filled:
+                        self.write(outdata[:filled])
+        except Exception as e:
+            # Like a sounddevice stream, stop rendering after an error
+            self.error = e
+            if on_error is not None:
+                on_error(e)
+
+    def write(self, block):
+        pass
+
+    def stop(self):
+        self._running.clear()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+
+class FileSink(NullSink):
+    """Output sink that records every rendered block to a sound file"""
+
+    def __init__(self, path, sr=22050, realtime=False):
+        super().__init__(realtime=realtime)
+        self.path = path
+        self.sr = sr
+        self._file = None
+
+    def start(self, callback, sr, blocksize, ready=None, on_error=None):
+        import soundfile as sf
+
+        self.sr = sr
+        self._file = sf.SoundFile(self.path, mode='w', samplerate=sr,
+                                  channels=1, subtype='FLOAT')
+        super().start(callback, sr, blocksize, ready, on_error)
+
+    def write(self, block):
+        self._file.write(block)
+
+    def stop(self):
+        super().stop()
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+
+class PlaybackQueue:
+    """Keep one output stream open and play queued buffers back to back
+
+    Buffers are normalized on enqueue (in the caller's thread), so the
+    audio callback only copies samples. When one buffer runs out inside a
+    block, the next one continues in the same block, which keeps
+    transitions gapless.
+
+    If the callback or the sink fails, the error is kept in .error, queued
+    clips are dropped and wait() returns False instead of blocking.
+    """
+
+    def __init__(self, sr=22050, volume=0.3, blocksize=1024, sink=None):
+        self.sr = sr
+        self.volume = volume
+        self.blocksize = blocksize
+        self.sink = sink if sink is not None else SoundDeviceSink()
+        self._queue = queue.Queue()
+        self._current = None
+        self._position = 0
+        self._pending = 0
+        self._idle = threading.Condition()
+        self._ready = threading.Event()
+        self._started = False
+        self._played = 0
+        self.error = None
+
+    def start(self):
+        """Open the output stream; it stays open until close()"""
+        if not self._started:
+            self.error = None
+            self._played = 0
+            self.sink.start(self._callback, self.sr, self.blocksize, self._ready,
+                            self._fail)
+            self._started = True
+        return self
+
+    def enqueue(self, audio, prepared=False):
+        """Queue a clip for playback and return its duration in seconds"""
+        buffer = audio if prepared else prepare_buffer(audio, self.volume)
+        if buffer.ndim != 1:
+            raise ValueError("prepared buffers must be 1-D mono arrays")
+        with self._idle:
+            if self.error is not None:
+                raise RuntimeError("playback stream failed") from self.error
+            self._pending += 1
+            self._queue.put(buffer)
+            self._ready.set()
+        return len(buffer) / self.sr
+
+    def wait(self, timeout=None):
+        """Block until every queued clip has been played
+
+        Returns False on timeout or if the stream failed.
+        """
+        with self._idle:
+            done = self._idle.wait_for(lambda: self._pending == 0, timeout)
+            return done and self.error is None
+
+    def close(self):
+        """Stop the stream; clips still in the queue are dropped"""
+        if self._started:
+            self.sink.stop()
+            self._started = False
+        self._drop_queued()
+
+    def _drop_queued(self):
+        with self._idle:
+            while True:
+                try:
+                    self._queue.get_nowait()
+                except queue.Empty:
+                    break
+            self._current = None
+            self._position = 0
+            self._pending = 0
+            self._ready.clear()
+            self._idle.notify_all()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+    @property
+    def pending(self):
+        return self._pending
+
+    @property
+    def played(self):
+        """Number of clips played to the end since start()"""
+        return self._played
+
+    def _next_buffer(self):
+        try:
+            self._current = self._queue.get_nowait()
+        except queue.Empty:
+            self._current = None
+        self._position = 0
+
+    def _finish_buffer(self):
+        with self._idle:
+            self._pending -= 1
+            self._played += 1
+            if self._pending == 0:
+                self._ready.clear()
+                self._idle.notify_all()
+
+    def _callback(self, outdata, frames, time_info, status):
+        try:
+            return self._render(outdata, frames)
+        except Exception as e:
+            self._fail(e)
+            raise
+
+    def _fail(self, error):
+        with self._idle:
+            if self.error is None:
+                self.error = error
+        self._drop_queued()
+
+    def _render(self, outdata, frames):
+        out = outdata[:, 0]
+        filled = 0
+        while filled < frames:
+            if self._current is None:
+                self._next_buffer()
+                if self._current is None:
+                    break
+            chunk = self._current[self._position:self._position + frames - filled]
+            out[filled:filled + len(chunk)] = chunk
+            filled += len(chunk)
+            self._position += len(chunk)
+            if self._position >= len(self._current):
+                self._current = None
+                self._finish_buffer()
+        out[filled:] = 0
+        return filled
@@ -0,0 +1,43 @@
+"""Deterministic synthetic test signals shared by the demos and golden tests"""
+
+import numpy as np
+
+
+def generate_signals(sr=22050, duration=3.0, seed=0, noise_level=0.0):
+    """Generate the project's synthetic voice-like signals
+
+    Used by generate_and_test_audio.py (vowel formants, harmonic series,
+    chirp), test_audio_playback.py (A major chord) and the golden tests.
+    Optional noise is drawn from a seeded generator, so the same arguments
+    always return bit-identical float64 arrays.
+    """
+    rng = np.random.default_rng(seed)
+    t = np.linspace(0, duration, int(sr * duration))
+    signals = {}
+
+    # Synthetic "ah" vowel formants with a natural speech envelope
+    f1, f2, f3 = 730, 1090, 2440
+    vowel = (np.sin(2*np.pi*f1*t) + 0.7*np.sin(2*np.pi*f2*t) + 0.3*np.sin(2*np.pi*f3*t)) * 0.2
+    envelope = np.exp(-t*0.5) * (1 + 0.1*np.sin(2*np.pi*5*t))
+    signals['synthetic_vowel'] = vowel * envelope
+
+    # Harmonic series on a typical male voice fundamental
+    f0 = 150
+    voice_like = np.zeros_like(t)
+    for h in range(1, 8):
+        voice_like += 1.0 / (h**0.8) * np.sin(2*np.pi*f0*h*t)
+    signals['voice_harmonics'] = voice_like * np.exp(-t*0.3) * 0.15
+
+    # Frequency sweep across the voice range
+    f_start, f_end = 80, 8000
+    signals['frequency_sweep'] = np.sin(2*np.pi * (f_start + (f_end-f_start)*t/duration) * t) * 0.2
+
+    # A major chord (A-C#-E)
+    chord = (np.sin(2*np.pi*440*t) + np.sin(2*np.pi*554.37*t) + np.sin(2*np.pi*659.25*t)) / 3
+    signals['major_chord'] = chord * 0.3
+
+    if noise_level:
+        for name in signals:
+            signals[name] = signals[name] + noise_level * rng.standard_normal(len(t))
+
+    return signals
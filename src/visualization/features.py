@@ -0,0 +1,152 @@
+"""Batch rendering of spectrogram, MFCC, chroma and pitch plots for QA"""
+
+import os
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+import numpy as np
+
+# Per-process figure state, created once by the pool initializer
+_FIGURE = None
+_AXES = None
+
+
+def decimate_columns(matrix, max_columns, reduce='max'):
+    """Reduce a (rows, frames) matrix to at most max_columns display columns
+
+    Frames are grouped into equal-width bins and each bin is collapsed
+    with max (keeps short transients visible) or mean. Returns the
+    decimated matrix and the frame index at the start of each column.
+    """
+    matrix = np.asarray(matrix)
+    n_frames = matrix.shape[-1]
+    if max_columns is None or n_frames <= max_columns:
+        return matrix, np.arange(n_frames)
+
+    step = int(np.ceil(n_frames / max_columns))
+    n_columns = int(np.ceil(n_frames / step))
+    pad = n_columns * step - n_frames
+    if pad:
+        edge = matrix[..., -1:]
+        matrix = np.concatenate([matrix, np.repeat(edge, pad, axis=-1)], axis=-1)
+    binned = matrix.reshape(matrix.shape[:-1] + (n_columns, step))
+    reducer = np.nanmax if reduce == 'max' else np.nanmean
+    return reducer(binned, axis=-1), np.arange(n_columns) * step
+
+
+def compute_features(y, sr, hop_length=512, n_mfcc=13, fmin=65.0, fmax=2093.0):
+    """Compute the feature matrices shown on a QA sheet"""
+    import librosa
+
+    stft = np.abs(librosa.stft(y, hop_length=hop_length))
+    spectrogram = librosa.amplitude_to_db(stft, ref=np.max)
+    mfcc = librosa.feature.mfcc(S=librosa.power_to_db(
+        librosa.feature.melspectrogram(S=stft**2, sr=sr)), n_mfcc=n_mfcc)
+    chroma = librosa.feature.chroma_stft(S=stft**2, sr=sr)
+    pitch = librosa.yin(y, fmin=fmin, fmax=fmax, sr=sr, hop_length=hop_length)
+    return {
+        'spectrogram': spectrogram,
+        'mfcc': mfcc,
+        'chroma': chroma,
+        'pitch': pitch,
+        'frequencies': librosa.fft_frequencies(sr=sr, n_fft=2 * (stft.shape[0] - 1)),
+    }
+
+
+def _init_worker(figsize=(12, 9), dpi=100):
+    """Build the Agg figure reused for every clip in this process
+
+    The figure is attached to its own FigureCanvasAgg instead of going
+    through pyplot, so the caller's backend (e.g. inline plotting in a
+    notebook) is left untouched and no pyplot figures accumulate.
+    """
+    global _FIGURE, _AXES
+    if _FIGURE is not None:
+        return
+    from matplotlib.backends.backend_agg import FigureCanvasAgg
+    from matplotlib.figure import Figure
+
+    _FIGURE = Figure(figsize=figsize, dpi=dpi, layout='constrained')
+    FigureCanvasAgg(_FIGURE)
+    _AXES = _FIGURE.subplots(3, 1)
+
+
+def render_clip(name, y, sr, output_dir, hop_length=512, max_columns=2000,
+                fmt='png'):
+    """Render one clip's QA sheet onto the worker's figure and save it"""
+    _init_worker()
+
+    features = compute_features(y, sr, hop_length=hop_length)
+    frame_time = hop_length / sr
+    spec, spec_frames = decimate_columns(features['spectrogram'], max_columns)
+    mfcc, mfcc_frames = decimate_columns(features['mfcc'], max_columns, 'mean')
+    chroma, chroma_frames = decimate_columns(features['chroma'], max_columns)
+    pitch, pitch_frames = decimate_columns(features['pitch'], max_columns, 'mean')
+
+    def extent(frames, low, high):
+        end = (frames[-1] + (frames[1] - frames[0] if len(frames) > 1 else 1))
+        return [0, end * frame_time, low, high]
+
+    ax_spec, ax_mfcc, ax_chroma = _AXES
+    for ax in _AXES:
+        ax.cla()
+
+    freqs = features['frequencies']
+    ax_spec.imshow(spec, origin='lower', aspect='auto', cmap='magma',
+                   extent=extent(spec_frames, freqs[0], freqs[-1]))
+    ax_spec.plot(pitch_frames * frame_time, pitch, color='cyan', linewidth=1,
+                 label='pitch (yin)')
+    ax_spec.set_ylim(0, min(freqs[-1], 4000))
+    ax_spec.set_ylabel('Hz')
+    ax_spec.set_title(f'{name} - spectrogram (dB) with pitch')
+    ax_spec.legend(loc='upper right')
+
+    ax_mfcc.imshow(mfcc, origin='lower', aspect='auto', cmap='coolwarm',
+                   extent=extent(mfcc_frames, 0, mfcc.shape[0]))
+    ax_mfcc.set_ylabel('MFCC')
+    ax_mfcc.set_title('MFCC')
+
+    ax_chroma.imshow(chroma, origin='lower', aspect='auto', cmap='viridis',
+                     extent=extent(chroma_frames, 0, 12))
+    ax_chroma.set_yticks(np.arange(12) + 0.5)
+    ax_chroma.set_yticklabels(['C', 'C#', 'D', 'D#', 'E', 'F',
+                               'F#', 'G', 'G#', 'A', 'A#', 'B'])
+    ax_chroma.set_xlabel('Time (s)')
+    ax_chroma.set_title('Chroma')
+
+    path = Path(output_dir) / f'{name}.{fmt}'
+    _FIGURE.savefig(path)
+    return str(path)
+
+
+def _render_task(task):
+    name, source, sr, output_dir, options = task
+    if isinstance(source, (str, os.PathLike)):
+        import librosa
+        y, sr = librosa.load(source, sr=sr)
+    else:
+        y = np.asarray(source, dtype=np.float32)
+    return render_clip(name, y, sr, output_dir, **options)
+
+
+def render_batch(clips, output_dir, sr=22050, workers=None, chunksize=8,
+                 **options):
+    """Render QA images for many clips in a process pool
+
+    clips maps a name to either a path (loaded inside the worker) or an
+    audio array at sample rate sr. Each worker process draws onto a
+    single Agg figure, and clips are dispatched in chunks to keep
+    inter-process overhead low. Returns the list of written image paths.
+    """
+    output_dir = Path(output_dir)
+    output_dir.mkdir(parents=True, exist_ok=True)
+
+    tasks = [(name, source, sr, str(output_dir), options)
+             for name, source in clips.items()]
+    if workers == 1:
+        _init_worker()
+        return [_render_task(task) for task in tasks]
+
+    with ProcessPoolExecutor(max_workers=workers,
+                             initializer=_init_worker) as pool:
+        return list(pool.map(_render_task, tasks, chunksize=chunksize))